@@ -6,14 +6,32 @@ import time
 import threading
 import logging
 import socket
+import struct
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from functools import wraps
-from typing import Optional, List, Dict, Generator, Any
+from typing import Optional, List, Dict, Generator, Any, BinaryIO, Callable, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; interface lookup is skipped
+    fcntl = None
+
 from flask import Flask, Response, render_template, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
 import pychromecast
 from pychromecast import CastBrowser, get_chromecast_from_host
-from pychromecast.discovery import AbstractCastListener, SimpleCastListener
+from pychromecast.discovery import AbstractCastListener
+from pychromecast.controllers.media import MediaController, MediaStatusListener
+from pychromecast.controllers.receiver import CastStatusListener
+from pychromecast.models import CastInfo
 from zeroconf import Zeroconf, InterfaceChoice
+from waitress import serve
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
 
 # Configure logging with timestamps and context
 logging.basicConfig(
@@ -25,62 +43,310 @@ logger = logging.getLogger(__name__)
 # Suppress Flask development server warning
 logging.getLogger("werkzeug").setLevel(logging.INFO)
 
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used for every dict a route returns"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize obj to a JSON string"""
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """Deserialize JSON from a string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response, handing orjson's bytes over without a str"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj), mimetype="application/json"
+        )
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # Environment configuration
-MUSIC_FOLDER = os.environ.get("MUSIC_FOLDER", "music/")
+# Normalized once with a trailing separator so file paths are plain concatenation
+MUSIC_FOLDER = os.path.normpath(os.environ.get("MUSIC_FOLDER", "music/")) + os.sep
 DEFAULT_DEVICE = os.environ.get("DEFAULT_DEVICE", "Bedroom speaker")
 PORT = int(os.environ.get("PORT", "5067"))
-LOOP_DELAY = float(os.environ.get("LOOP_DELAY", "0.1"))
-DEFAULT_VOLUME = int(os.environ.get("DEFAULT_VOLUME", "5"))
+# Clamped once here so set_volume() only ever sees 1-100
+DEFAULT_VOLUME = min(100, max(1, int(os.environ.get("DEFAULT_VOLUME", "5"))))
+STREAM_RATE = int(os.environ.get("STREAM_RATE", "40960"))  # bytes per second
+STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", "65536"))  # bytes
+DISCOVERY_TIMEOUT = float(os.environ.get("DISCOVERY_TIMEOUT", "5"))
+CONNECT_TIMEOUT = float(os.environ.get("CONNECT_TIMEOUT", "30"))
+WSGI_THREADS = int(os.environ.get("WSGI_THREADS", "8"))
+
+# Every casing of ".mp3", so filenames can be matched without lowercasing
+MP3_SUFFIXES = (".mp3", ".mP3", ".Mp3", ".MP3")
+
+
+@dataclass
+class StreamerState:
+    """Playback and connection state shared between request threads
+
+    Writes happen under lock; handlers snapshot chromecast and
+    media_controller under it and make the network calls outside.
+    cast_lock serializes connect/disconnect/volume so they never hold
+    lock across a Chromecast round trip.
+    """
 
-# Global state variables (thread-safe)
-is_paused = True
-chromecast = None
-media_controller = None
-current_volume = DEFAULT_VOLUME
-lock = threading.Lock()
-current_file_index = 0
-stream_active = False
+    is_paused: bool = True
+    chromecast: Optional[pychromecast.Chromecast] = None
+    media_controller: Optional[MediaController] = None
+    media_listener: Optional["MediaPlayingListener"] = None
+    status_listener: Optional["CastStatusReadyListener"] = None
+    current_volume: int = DEFAULT_VOLUME
+    current_file_index: int = 0
+    stream_active: bool = False
+    stream_generation: int = 0  # Bumped per /stream so only the newest one runs
+    lock: Any = field(default_factory=threading.RLock)
+    cast_lock: Any = field(default_factory=threading.Lock)
+
+
+# Global state (thread-safe via STATE.lock)
+STATE = StreamerState()
+resume_event = threading.Event()  # Set while the stream may produce audio
+# Notified on pause/stop/new stream so paced generators re-check right away
+_stream_control = threading.Condition()
+
+# Runs Chromecast control RPCs in order, off the request threads
+_cast_ctl_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cast-ctl")
+_pending_restart: Optional[Future] = None  # Queued restart not yet started
+_last_ctl: Optional[Future] = None  # Most recently submitted control action
+_cast_ctl_lock = threading.Lock()
+
+# Opens the next track in the background while the current one finishes
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+
+# MP3 listing cache, invalidated when the music folder's mtime changes. The
+# mtime itself is re-checked at most once per interval (NAS stats are slow)
+MP3_RECHECK_INTERVAL = 1.0
+# While the watcher runs it reports local changes itself, so the mtime check
+# only backs it up for changes it can't see and can run far less often
+MP3_WATCHED_RECHECK_INTERVAL = 60.0
+_mp3_cache: Dict[str, Any] = {
+    "mtime": None,
+    "checked": 0.0,
+    "files": [],
+    "names": [],
+}
+_mp3_cache_lock = threading.Lock()
+# Filesystem watcher on MUSIC_FOLDER; while it runs the mtime check relaxes to
+# MP3_WATCHED_RECHECK_INTERVAL, catching only what it misses (NFS/SMB peers)
+_music_observer: Optional[Observer] = None
+
+# Shared Zeroconf instance, created lazily on first discovery
+_ZCONF: Optional[Zeroconf] = None
+_zconf_lock = threading.Lock()
+
+# Persistent Chromecast discovery, started once and kept running
+_cast_browser: Optional[CastBrowser] = None
+_cast_listener: Optional["CastDeviceListener"] = None
+_cast_browser_started = 0.0
+_cast_browser_lock = threading.Lock()
+
+
+def _interface_ipv4() -> Optional[str]:
+    """Find a non-loopback IPv4 address without needing a route or DNS
+
+    Tries the hostname's own addresses first, then asks the kernel for
+    each interface's address (Linux only).
+
+    Returns:
+        Optional[str]: First non-loopback address found, or None
+    """
+    try:
+        for *_, sockaddr in socket.getaddrinfo(
+            socket.gethostname(), None, socket.AF_INET
+        ):
+            if not sockaddr[0].startswith("127."):
+                return sockaddr[0]
+    except OSError:
+        pass
+
+    if fcntl is None:
+        return None
+
+    SIOCGIFADDR = 0x8915
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            for _, name in socket.if_nameindex():
+                try:
+                    packed = fcntl.ioctl(
+                        s.fileno(),
+                        SIOCGIFADDR,
+                        struct.pack("256s", name[:15].encode()),
+                    )
+                except OSError:
+                    continue  # Interface has no IPv4 address
+                ip = socket.inet_ntoa(packed[20:24])
+                if not ip.startswith("127."):
+                    return ip
+    except OSError as e:
+        logger.debug(f"Could not list network interfaces: {e}")
+    return None
 
 
-def get_lan_ip() -> str:
+def _compute_lan_ip() -> str:
     """Get the LAN IP address of the machine
 
     Returns:
         str: Local IP address or 'localhost' on failure
     """
+    # Connecting a UDP socket sends nothing; it only asks the kernel which
+    # interface routes outward, which picks the right one on multi-homed hosts
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        lan_ip = s.getsockname()[0]
-        s.close()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError as e:
+        logger.debug(f"No outbound route for LAN IP lookup: {e}")
+
+    # No default route yet (e.g. early boot): fall back to interface addresses
+    lan_ip = _interface_ipv4()
+    if lan_ip:
         return lan_ip
-    except Exception:
-        logger.warning("Could not determine LAN IP, using localhost")
-        return "localhost"
+    logger.warning("Could not determine LAN IP, using localhost")
+    return "localhost"
+
+
+# Resolved at startup and kept once found; a "localhost" fallback (e.g. the
+# network wasn't up yet) is retried by get_stream_url() on the next play
+LAN_IP = _compute_lan_ip()
+STREAM_URL = f"http://{LAN_IP}:{PORT}/stream"
+
+
+def get_stream_url() -> str:
+    """Get the URL the Chromecast should fetch the stream from
+
+    Returns:
+        str: Stream URL, re-resolving the LAN IP if it wasn't found yet
+    """
+    global LAN_IP, STREAM_URL
+
+    if LAN_IP == "localhost":
+        lan_ip = _compute_lan_ip()
+        if lan_ip != "localhost":
+            logger.info(f"LAN IP resolved: {lan_ip}")
+            LAN_IP = lan_ip
+            STREAM_URL = f"http://{LAN_IP}:{PORT}/stream"
+    return STREAM_URL
+
+
+def _mp3_listing() -> Dict[str, Any]:
+    """Get the cached MP3 listing, rescanning only if the folder's mtime changed
+
+    Returns:
+        Dict: Listing with sorted "files" (paths) and matching "names"
+    """
+    global _mp3_cache
+
+    now = time.monotonic()
+    cache = _mp3_cache
+    interval = (
+        MP3_WATCHED_RECHECK_INTERVAL
+        if _music_observer is not None
+        else MP3_RECHECK_INTERVAL
+    )
+    if cache["mtime"] is not None and now - cache["checked"] < interval:
+        return cache
+
+    try:
+        mtime = os.stat(MUSIC_FOLDER).st_mtime_ns
+    except OSError:
+        logger.warning(f"Music folder not found: {MUSIC_FOLDER}")
+        return {"mtime": None, "checked": now, "files": [], "names": []}
+
+    with _mp3_cache_lock:
+        _mp3_cache["checked"] = now
+        if _mp3_cache["mtime"] != mtime:
+            with os.scandir(MUSIC_FOLDER) as entries:
+                found = sorted(
+                    (entry.path, entry.name)
+                    for entry in entries
+                    if entry.name.endswith(MP3_SUFFIXES) and entry.is_file()
+                )
+            # Swap in a new dict so callers never see files and names disagree
+            _mp3_cache = {
+                "mtime": mtime,
+                "checked": now,
+                "files": [path for path, _ in found],
+                "names": [name for _, name in found],
+            }
+        return _mp3_cache
 
 
 def get_mp3_files() -> List[str]:
     """Get all MP3 files from the music folder
 
+    The listing is cached and only rebuilt when the folder watcher reports a
+    change or the folder's mtime changes, which is checked at most once per
+    MP3_RECHECK_INTERVAL (MP3_WATCHED_RECHECK_INTERVAL while watched).
+
     Returns:
         List[str]: Sorted list of MP3 file paths
     """
-    if not os.path.exists(MUSIC_FOLDER):
-        logger.warning(f"Music folder not found: {MUSIC_FOLDER}")
-        return []
+    return _mp3_listing()["files"]
+
+
+def get_mp3_file_names() -> List[str]:
+    """Get the file names of all MP3 files, in the same order as get_mp3_files()
+
+    Returns:
+        List[str]: Sorted list of MP3 file names without the folder
+    """
+    return _mp3_listing()["names"]
 
-    mp3_files_list = []
-    for filename in os.listdir(MUSIC_FOLDER):
-        if filename.lower().endswith(".mp3"):
-            mp3_files_list.append(os.path.join(MUSIC_FOLDER, filename))
 
-    return sorted(mp3_files_list)
+def invalidate_mp3_cache() -> None:
+    """Force the next get_mp3_files() call to rescan the music folder"""
+    with _mp3_cache_lock:
+        _mp3_cache["mtime"] = None
 
 
-def create_zeroconf() -> Zeroconf:
+class MusicFolderHandler(FileSystemEventHandler):
+    """Invalidates the MP3 listing when MP3 files are added, removed or renamed"""
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        """Called by the observer for every change in the music folder"""
+        if event.is_directory or event.event_type not in (
+            "created",
+            "deleted",
+            "moved",
+        ):
+            return
+        paths = (event.src_path, getattr(event, "dest_path", ""))
+        if any(path.endswith(MP3_SUFFIXES) for path in paths):
+            logger.debug(f"Music folder changed: {event.src_path}")
+            invalidate_mp3_cache()
+
+
+def start_music_watcher() -> None:
+    """Watch MUSIC_FOLDER so local changes refresh the MP3 listing right away
+
+    The periodic mtime check stays on at a longer interval, since inotify
+    misses changes made by other hosts on network mounts.
+    """
+    global _music_observer
+
+    try:
+        observer = Observer()
+        observer.schedule(MusicFolderHandler(), MUSIC_FOLDER, recursive=False)
+        observer.daemon = True
+        observer.start()
+    except OSError as e:
+        logger.warning(f"Could not watch {MUSIC_FOLDER}, using mtime checks: {e}")
+        return
+
+    atexit.register(observer.stop)
+    _music_observer = observer
+
+
+def _create_zeroconf() -> Zeroconf:
     """Create a Zeroconf instance with interface binding to avoid buffer issues
 
     Returns:
@@ -94,12 +360,148 @@ def create_zeroconf() -> Zeroconf:
             return Zeroconf(interfaces=InterfaceChoice.Default)
         except OSError:
             logger.debug("InterfaceChoice.Default failed, trying specific IP")
-            lan_ip = get_lan_ip()
-            if lan_ip != "localhost":
-                return Zeroconf(interfaces=[lan_ip])
+            if LAN_IP != "localhost":
+                return Zeroconf(interfaces=[LAN_IP])
             raise
 
 
+def _close_zeroconf() -> None:
+    """Close the shared Zeroconf instance at interpreter exit"""
+    with _zconf_lock:
+        if _ZCONF is not None:
+            _ZCONF.close()
+
+
+def get_zeroconf() -> Zeroconf:
+    """Get the shared Zeroconf instance, creating it on first use
+
+    Returns:
+        Zeroconf: Long-lived Zeroconf instance
+    """
+    global _ZCONF
+
+    with _zconf_lock:
+        if _ZCONF is None:
+            _ZCONF = _create_zeroconf()
+            atexit.register(_close_zeroconf)
+        return _ZCONF
+
+
+class CastDeviceListener(AbstractCastListener):
+    """CastBrowser listener that wakes up lookups waiting on device changes
+
+    Attributes:
+        changed: Condition notified whenever a device is added, updated or removed
+        last_change: time.monotonic() of the latest change
+    """
+
+    def __init__(self) -> None:
+        self.changed = threading.Condition()
+        self.last_change = time.monotonic()
+
+    def _notify(self) -> None:
+        """Record the change time and wake threads waiting on changed"""
+        with self.changed:
+            self.last_change = time.monotonic()
+            self.changed.notify_all()
+
+    def add_cast(self, uuid, service) -> None:
+        """Called when a new device is discovered"""
+        logger.debug(f"Discovered device: {service}")
+        self._notify()
+
+    def update_cast(self, uuid, service) -> None:
+        """Called when a known device changes"""
+        self._notify()
+
+    def remove_cast(self, uuid, service, cast_info) -> None:
+        """Called when a device goes away"""
+        logger.debug(f"Lost device: {cast_info.friendly_name}")
+        self._notify()
+
+
+class MediaPlayingListener(MediaStatusListener):
+    """Media status listener that tracks whether the Chromecast is playing
+
+    Attributes:
+        playing: Event set while the player state is PLAYING
+        idle: Event set while the player state is IDLE (e.g. after a stop)
+    """
+
+    def __init__(self) -> None:
+        self.playing = threading.Event()
+        self.idle = threading.Event()
+
+    def new_media_status(self, status) -> None:
+        """Called by the media controller on every status update"""
+        for event, state in ((self.playing, "PLAYING"), (self.idle, "IDLE")):
+            if status.player_state == state:
+                event.set()
+            else:
+                event.clear()
+
+    def load_media_failed(self, queue_item_id, error_code) -> None:
+        """Called when the Chromecast fails to load the stream"""
+        logger.error(f"Chromecast failed to load media: error {error_code}")
+
+
+class CastStatusReadyListener(CastStatusListener):
+    """Receiver status listener that wakes callers waiting for the device
+
+    Attributes:
+        updated: Event set whenever the Chromecast reports a new status
+    """
+
+    def __init__(self) -> None:
+        self.updated = threading.Event()
+
+    def new_cast_status(self, status) -> None:
+        """Called by the receiver controller on every status update"""
+        self.updated.set()
+
+
+def _stop_cast_browser() -> None:
+    """Stop the shared CastBrowser at interpreter exit"""
+    with _cast_browser_lock:
+        if _cast_browser is not None:
+            _cast_browser.stop_discovery()
+
+
+def get_cast_browser() -> CastBrowser:
+    """Get the shared CastBrowser, starting discovery on first use
+
+    Returns:
+        CastBrowser: Browser whose devices map is kept up to date in the background
+    """
+    global _cast_browser, _cast_listener, _cast_browser_started
+
+    with _cast_browser_lock:
+        if _cast_browser is None:
+            listener = CastDeviceListener()
+            browser = CastBrowser(listener, get_zeroconf(), known_hosts=None)
+            browser.start_discovery()
+            _cast_browser, _cast_listener = browser, listener
+            _cast_browser_started = listener.last_change
+            atexit.register(_stop_cast_browser)
+        return _cast_browser
+
+
+def _match_cast_info(browser: CastBrowser, target_name: str) -> Optional[CastInfo]:
+    """Find a discovered device whose name contains target_name
+
+    Args:
+        browser: Running CastBrowser
+        target_name: Device name (or part of it) to look for
+
+    Returns:
+        Optional[CastInfo]: Matching device or None
+    """
+    for device in list(browser.devices.values()):
+        if target_name in device.friendly_name:
+            return device
+    return None
+
+
 def find_chromecast(device_name: Optional[str] = None) -> bool:
     """Find and connect to Chromecast device
 
@@ -109,54 +511,35 @@ def find_chromecast(device_name: Optional[str] = None) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    global chromecast, media_controller
+    target_name = device_name or DEFAULT_DEVICE
 
-    zconf = None
-    browser = None
-    try:
-        logger.info(
-            f"Searching for Chromecast device... (name: {device_name or DEFAULT_DEVICE})"
-        )
-        zconf = create_zeroconf()
-
-        found_device = None
-
-        def add_cast_callback(uuid, service):
-            """Callback for device discovery."""
-            nonlocal found_device
-            device = browser.devices.get(uuid)
-            if device:
-                friendly_name = device.friendly_name
-                logger.debug(f"Discovered device: {friendly_name}")
-
-                target_name = device_name or DEFAULT_DEVICE
-                if target_name in friendly_name and found_device is None:
-                    found_device = device
-
-        listener = SimpleCastListener(add_callback=add_cast_callback)
-        browser = CastBrowser(listener, zconf, known_hosts=None)
-        browser.start_discovery()
-
-        timeout = 5
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if found_device:
-                break
-            time.sleep(0.1)
+    # Already connected to a matching device: nothing to discover
+    with STATE.lock:
+        current = STATE.chromecast
+    if current is not None and target_name in current.cast_info.friendly_name:
+        logger.info(f"Already connected to {current.cast_info.friendly_name}")
+        return True
 
-        browser.stop_discovery()
+    try:
+        logger.info(f"Searching for Chromecast device... (name: {target_name})")
+        browser = get_cast_browser()
+
+        # Already-known devices match immediately, otherwise wait for discovery
+        with _cast_listener.changed:
+            found_device = _cast_listener.changed.wait_for(
+                lambda: _match_cast_info(browser, target_name),
+                timeout=DISCOVERY_TIMEOUT,
+            )
 
         if not found_device:
-            logger.warning(
-                f"No Chromecast device found for: {device_name or DEFAULT_DEVICE}"
-            )
+            logger.warning(f"No Chromecast device found for: {target_name}")
             return False
 
         cast_info = found_device
 
         # Create Chromecast object from CastInfo
         logger.info("Connecting to Chromecast...")
-        chromecast = pychromecast.get_chromecast_from_host(
+        cc = pychromecast.get_chromecast_from_host(
             (
                 cast_info.host,
                 cast_info.port,
@@ -165,14 +548,31 @@ def find_chromecast(device_name: Optional[str] = None) -> bool:
                 cast_info.friendly_name,
             )
         )
-        chromecast.wait()
+        cc.wait(timeout=CONNECT_TIMEOUT)
+        if cc.status is None:
+            logger.error(
+                f"Chromecast did not report status within {CONNECT_TIMEOUT}s"
+            )
+            cc.disconnect(timeout=2.0)
+            return False
+
+        # Get notified of player state changes instead of polling for them
+        media_listener = MediaPlayingListener()
+        cc.media_controller.register_status_listener(media_listener)
+        status_listener = CastStatusReadyListener()
+        cc.register_status_listener(status_listener)
 
-        # Use the built-in media controller
-        media_controller = chromecast.media_controller
+        with STATE.lock:
+            STATE.chromecast = cc
+            # Use the built-in media controller
+            STATE.media_controller = cc.media_controller
+            STATE.media_listener = media_listener
+            STATE.status_listener = status_listener
+            volume_percent = STATE.current_volume
 
         # Set volume with retry
-        if set_volume(current_volume):
-            logger.info(f"Chromecast connected successfully, volume: {current_volume}%")
+        if set_volume(volume_percent):
+            logger.info(f"Chromecast connected successfully, volume: {volume_percent}%")
             return True
         else:
             logger.error("Failed to set volume after connection")
@@ -184,14 +584,6 @@ def find_chromecast(device_name: Optional[str] = None) -> bool:
     except Exception as e:
         logger.error(f"Unexpected error finding Chromecast: {e}", exc_info=True)
         return False
-    finally:
-        if browser:
-            try:
-                browser.stop_discovery()
-            except Exception:
-                pass
-        if zconf:
-            zconf.close()
 
 
 def disconnect_chromecast() -> bool:
@@ -200,33 +592,39 @@ def disconnect_chromecast() -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    global chromecast, media_controller, is_paused, stream_active, current_file_index
+    with STATE.lock:
+        cc, mc = STATE.chromecast, STATE.media_controller
 
-    if chromecast is None:
+    if cc is None:
         logger.warning("Cannot disconnect: No Chromecast connected")
         return False
 
     # Stop playback before disconnecting
-    if media_controller:
+    if mc:
         try:
             logger.info("Stopping media controller before disconnect")
-            media_controller.stop()
+            mc.stop()
         except Exception as e:
             logger.error(f"Error stopping media controller: {e}")
 
     try:
         logger.info("Disconnecting from Chromecast...")
-        chromecast.disconnect(timeout=2.0)
+        cc.disconnect(timeout=2.0)
         logger.info("Successfully disconnected from Chromecast")
     except Exception as e:
         logger.error(f"Error disconnecting from Chromecast: {e}")
 
     # Reset global state
-    chromecast = None
-    media_controller = None
-    is_paused = True
-    stream_active = False
-    current_file_index = 0
+    with STATE.lock:
+        STATE.chromecast = None
+        STATE.media_controller = None
+        STATE.media_listener = None
+        STATE.status_listener = None
+        STATE.is_paused = True
+        STATE.stream_active = False
+        STATE.current_file_index = 0
+        resume_event.set()  # Wake a held stream so it can exit
+    _wake_streams()
 
     return True
 
@@ -244,7 +642,7 @@ def require_chromecast_connected(func):
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        if chromecast is None:
+        if STATE.chromecast is None:
             logger.warning("Cannot execute: No Chromecast connected")
             return {"status": "failed", "message": "No Chromecast device connected"}
         return func(*args, **kwargs)
@@ -280,31 +678,39 @@ def set_volume(volume_percent: int, retries: int = 5, delay: float = 1) -> bool:
     Args:
         volume_percent: Volume level between 1-100
         retries: Number of retry attempts
-        delay: Delay between retries in seconds
+        delay: Longest wait for a device status between retries, in seconds
 
     Returns:
         bool: True if successful, False otherwise
     """
-    global current_volume, chromecast
+    with STATE.lock:
+        cc, status_listener = STATE.chromecast, STATE.status_listener
 
-    if chromecast is None:
+    if cc is None:
         logger.warning("Cannot set volume: No Chromecast connected")
         return False
 
-    # Convert 1-100 to 0.0-1.0
-    volume = max(0.0, min(1.0, volume_percent / 100.0))
+    # Convert 1-100 to 0.0-1.0 (callers have already range-checked it)
+    volume = volume_percent * 0.01
 
     logger.info(f"Setting volume to {volume_percent}%")
     for attempt in range(retries):
         try:
-            if chromecast and chromecast.status:
-                chromecast.set_volume(volume)
-                current_volume = volume_percent
+            # Cleared before the check so a status arriving after it still wakes us
+            if status_listener:
+                status_listener.updated.clear()
+            if cc.status:
+                cc.set_volume(volume)
+                with STATE.lock:
+                    STATE.current_volume = volume_percent
                 logger.info(f"Volume successfully set to {volume_percent}%")
                 return True
             else:
                 logger.debug(f"Attempt {attempt + 1}/{retries}: Chromecast not ready")
-                time.sleep(delay)
+                if status_listener:
+                    status_listener.updated.wait(delay)
+                else:
+                    time.sleep(delay)
         except Exception as e:
             logger.debug(f"Attempt {attempt + 1}/{retries} failed: {e}")
             if attempt < retries - 1:
@@ -322,15 +728,17 @@ def play_stream_on_chromecast() -> bool:
     Returns:
         bool: True if playback started successfully, False otherwise
     """
-    if not media_controller or not chromecast:
+    with STATE.lock:
+        cc, mc = STATE.chromecast, STATE.media_controller
+
+    if not mc or not cc:
         return False
 
     try:
-        local_ip = get_lan_ip()
-        stream_url = f"http://{local_ip}:{PORT}/stream"
+        stream_url = get_stream_url()
         logger.info(f"Playing stream from: {stream_url}")
 
-        media_controller.play_media(
+        mc.play_media(
             stream_url,
             "audio/mpeg",
             stream_type="BUFFERED",
@@ -343,6 +751,212 @@ def play_stream_on_chromecast() -> bool:
         return False
 
 
+def _restart_cast_playback(mc: MediaController) -> bool:
+    """Stop the current media and make the Chromecast fetch /stream again
+
+    Args:
+        mc: Media controller of the connected Chromecast
+
+    Returns:
+        bool: True if playback was restarted, False otherwise
+    """
+    with STATE.lock:
+        media_listener = STATE.media_listener
+
+    try:
+        logger.info("Stopping current playback")
+        if media_listener:
+            media_listener.idle.clear()
+        mc.stop()
+        # Wait for stop to complete, returning as soon as the device reports it
+        if media_listener:
+            media_listener.idle.wait(timeout=0.5)
+        else:
+            time.sleep(0.5)
+    except Exception as e:
+        logger.error(f"Error stopping media controller: {e}")
+    return play_stream_on_chromecast()
+
+
+def _submit_cast_ctl(fn: Callable[..., Any], mc: MediaController) -> Future:
+    """Queue a Chromecast control action behind the ones already submitted
+
+    Args:
+        fn: Control function to run on the cast-ctl thread
+        mc: Media controller of the connected Chromecast
+
+    Returns:
+        Future: Result of the queued action
+    """
+    global _last_ctl
+
+    with _cast_ctl_lock:
+        _last_ctl = _cast_ctl_executor.submit(fn, mc)
+        return _last_ctl
+
+
+def _queue_cast_restart(mc: MediaController) -> None:
+    """Queue a playback restart, folding it into one that hasn't started yet
+
+    The restart makes the Chromecast fetch /stream, which reads the playlist
+    position at that point, so rapid track changes only need one restart.
+    Folding only happens while that restart is still the last queued action;
+    otherwise e.g. a pause queued after it would run last and win.
+
+    Args:
+        mc: Media controller of the connected Chromecast
+    """
+    global _pending_restart, _last_ctl
+
+    with _cast_ctl_lock:
+        pending = _pending_restart
+        if (
+            pending is not None
+            and pending is _last_ctl
+            and not pending.running()
+            and not pending.done()
+        ):
+            logger.info("Playback restart already queued")
+            return
+        _pending_restart = _last_ctl = _cast_ctl_executor.submit(
+            _restart_cast_playback, mc
+        )
+
+
+def _pause_cast(mc: MediaController) -> None:
+    """Pause the media player on the Chromecast (preserves position)
+
+    Args:
+        mc: Media controller of the connected Chromecast
+    """
+    try:
+        logger.info("Pausing media controller")
+        mc.pause()
+    except Exception as e:
+        logger.error(f"Error pausing media controller: {e}")
+
+
+def _resume_cast(mc: MediaController) -> None:
+    """Resume the Chromecast from a paused or stopped state
+
+    Args:
+        mc: Media controller of the connected Chromecast
+    """
+    try:
+        # If media is paused (not stopped), resume from paused position
+        if mc.status and mc.status.player_state == "PAUSED":
+            logger.info("Resuming media controller from paused state")
+            mc.play()
+        else:
+            # Media is stopped, need to restart playback from beginning
+            logger.info("Media is stopped, restarting playback from beginning")
+            play_stream_on_chromecast()
+    except Exception as e:
+        logger.error(f"Error resuming stream: {e}")
+
+
+def _stop_cast(mc: MediaController) -> None:
+    """Stop the media player on the Chromecast
+
+    Args:
+        mc: Media controller of the connected Chromecast
+    """
+    try:
+        logger.info("Stopping media controller")
+        mc.stop()
+    except Exception as e:
+        logger.error(f"Error stopping media controller: {e}")
+
+
+def _seek(delta: int) -> Dict[str, Any]:
+    """Move delta files through the playlist and restart playback there
+
+    Args:
+        delta: Number of files to move, e.g. -1 for previous, 1 for next
+
+    Returns:
+        Dict: Status and file index
+    """
+    mp3_files_list = get_mp3_files()
+    if not mp3_files_list:
+        logger.error("No MP3 files available")
+        return {"status": "failed", "message": "No MP3 files found"}
+
+    with STATE.lock:
+        file_index = (STATE.current_file_index + delta) % len(mp3_files_list)
+        STATE.current_file_index = file_index
+        # Supersede the running stream now, so it can't overwrite the index
+        # before the Chromecast fetches /stream again
+        STATE.stream_generation += 1
+        STATE.is_paused = False
+        STATE.stream_active = True
+        resume_event.set()
+        cc, mc = STATE.chromecast, STATE.media_controller
+    _wake_streams()
+
+    logger.info(f"Seeking {delta:+d} to file: {file_index}")
+
+    if mc and cc:
+        _queue_cast_restart(mc)
+    return {"status": "success", "file_index": file_index}
+
+
+def _wake_streams() -> None:
+    """Wake running stream generators from their pacing sleep or pause hold"""
+    with _stream_control:
+        _stream_control.notify_all()
+
+
+def _open_for_streaming(path: str) -> BinaryIO:
+    """Open an MP3 file and hint the kernel to read ahead sequentially
+
+    The file is unbuffered: each readinto() is a single read(2) straight into
+    the caller's buffer, with no extra copy through Python's buffer layer.
+
+    Args:
+        path: Path of the file to open
+
+    Returns:
+        BinaryIO: Open binary file object
+    """
+    f = open(path, "rb", buffering=0)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+
+def _close_streamed(f: BinaryIO) -> None:
+    """Close a streamed file and drop its pages from the page cache
+
+    Args:
+        f: File object returned by _open_for_streaming
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+    f.close()
+
+
+def _discard_prefetch(future: Future) -> None:
+    """Close a prefetched file that will not be streamed
+
+    Args:
+        future: Future returned by submitting _open_for_streaming
+    """
+
+    def close(done: Future) -> None:
+        """Close the file once the prefetch has opened it"""
+        if done.exception() is None:
+            done.result().close()
+
+    future.add_done_callback(close)
+
+
 def stream_audio(file_index: int) -> Generator[bytes, None, None]:
     """Stream MP3 files to Chromecast in a continuous loop
 
@@ -352,7 +966,12 @@ def stream_audio(file_index: int) -> Generator[bytes, None, None]:
     Yields:
         bytes: Audio data chunks
     """
-    global current_file_index, stream_active
+    # Claim the stream; any older generator still running will see this and exit
+    with STATE.lock:
+        STATE.stream_generation += 1
+        generation = STATE.stream_generation
+    _wake_streams()
+
     global_mp3_files = get_mp3_files()
 
     if not global_mp3_files:
@@ -363,34 +982,96 @@ def stream_audio(file_index: int) -> Generator[bytes, None, None]:
         logger.warning(f"Invalid file_index: {file_index}")
         return
 
-    # Typical MP3 bitrate: 128kbps = 16KB/s, use 4KB chunks every 0.1s
-    chunk_size = 4096
-    chunk_interval = 0.1  # seconds between chunks for smoother playback
-    
+    # Typical MP3 bitrate: 128kbps = 16KB/s. Read STREAM_CHUNK_SIZE at a time
+    # into a reusable buffer and pace output at STREAM_RATE against a deadline
+    buf = bytearray(STREAM_CHUNK_SIZE)
+    view = memoryview(buf)
+
     # Start from the given index and loop continuously
     idx = file_index
-    
-    while stream_active:
-        current_file = global_mp3_files[idx]
-        logger.info(f"Streaming file: {current_file}")
-        current_file_index = idx
-        
-        # Stream the file
-        try:
-            with open(current_file, "rb") as f:
-                while True:
-                    data = f.read(chunk_size)
-                    if not data:
-                        break
-                    yield data
-                    # Small delay to prevent blocking
-                    time.sleep(chunk_interval)
-        except Exception as e:
-            logger.warning(f"Error streaming file: {current_file}: {e}")
-            break
-        
-        # Move to next file, wrap around to 0 after last file
-        idx = (idx + 1) % len(global_mp3_files)
+    next_deadline = time.monotonic()
+    # (path, future) of the next file, opened once the current one is ~90% sent
+    prefetch: Optional[Tuple[str, Future]] = None
+    # Control checks run once per chunk (~1.6s wall-clock at the default
+    # STREAM_RATE, ~4s of 128 kbps audio), which is already coarse, so they
+    # aren't batched further; skip attribute lookups
+    is_resumed = resume_event.is_set
+
+    try:
+        while STATE.stream_active and generation == STATE.stream_generation:
+            current_file = global_mp3_files[idx]
+            logger.info(f"Streaming file: {current_file}")
+            with STATE.lock:
+                # A newer stream (e.g. after a seek) owns the index now
+                if generation != STATE.stream_generation:
+                    logger.info("Stream superseded by a newer request")
+                    return
+                STATE.current_file_index = idx
+            next_file = global_mp3_files[(idx + 1) % len(global_mp3_files)]
+
+            # Stream the file
+            try:
+                if prefetch and prefetch[0] == current_file:
+                    f = prefetch[1].result()
+                else:
+                    if prefetch:
+                        _discard_prefetch(prefetch[1])
+                    f = _open_for_streaming(current_file)
+                prefetch = None
+
+                try:
+                    prefetch_at = os.fstat(f.fileno()).st_size * 0.9
+                    sent = 0
+                    while True:
+                        if not is_resumed():
+                            # Hold the stream while paused until /resume, /stop
+                            # or a newer stream takes over
+                            with _stream_control:
+                                _stream_control.wait_for(
+                                    lambda: is_resumed()
+                                    or generation != STATE.stream_generation
+                                    or not STATE.stream_active
+                                )
+                            next_deadline = time.monotonic()
+                        if generation != STATE.stream_generation:
+                            logger.info("Stream superseded by a newer request")
+                            return
+                        if not STATE.stream_active:
+                            return  # Stopped or disconnected
+                        n = f.readinto(buf)
+                        if not n:
+                            break
+                        sent += n
+                        if prefetch is None and sent >= prefetch_at:
+                            future = _prefetch_executor.submit(
+                                _open_for_streaming, next_file
+                            )
+                            prefetch = (next_file, future)
+                        yield bytes(view[:n])
+                        # Sleep off the time this chunk buys, without drift,
+                        # unless a control change wakes us first
+                        next_deadline += n / STREAM_RATE
+                        delay = next_deadline - time.monotonic()
+                        if delay > 0:
+                            with _stream_control:
+                                _stream_control.wait(delay)
+                finally:
+                    _close_streamed(f)
+            except Exception as e:
+                logger.warning(f"Error streaming file: {current_file}: {e}")
+                break
+
+            # Move to next file, wrap around to 0 after last file. The playlist
+            # is only reloaded on wrap so indexes stay stable within a cycle
+            idx = (idx + 1) % len(global_mp3_files)
+            if idx == 0:
+                global_mp3_files = get_mp3_files()
+                if not global_mp3_files:
+                    logger.warning("No MP3 files available for streaming")
+                    return
+    finally:
+        if prefetch:
+            _discard_prefetch(prefetch[1])
 
 
 @app.route("/stream")
@@ -401,7 +1082,7 @@ def stream_audio_endpoint() -> Response:
         Response: Flask response with audio data
     """
     return Response(
-        stream_audio(current_file_index),
+        stream_audio(STATE.current_file_index),
         mimetype="audio/mpeg",
         headers={
             "Cache-Control": "no-cache",
@@ -409,11 +1090,33 @@ def stream_audio_endpoint() -> Response:
             "Expires": "0",
             "Access-Control-Allow-Origin": "*",
             "Content-Type": "audio/mpeg",
-            "Connection": "keep-alive",
         },
     )
 
 
+@app.route("/file/<int:file_index>")
+def serve_file(file_index: int) -> Response:
+    """Serve a single MP3 file with Range and conditional request support
+
+    Args:
+        file_index: Index of the file in the playlist
+
+    Returns:
+        Response: File response (sent via wsgi.file_wrapper) or 404
+    """
+    names = get_mp3_file_names()
+    if file_index >= len(names):
+        logger.warning(f"Invalid file_index: {file_index}")
+        return {"status": "failed", "message": "File not found"}, 404
+
+    return send_from_directory(
+        os.path.abspath(MUSIC_FOLDER),
+        names[file_index],
+        mimetype="audio/mpeg",
+        conditional=True,
+    )
+
+
 @app.route("/")
 def index() -> str:
     """Serve the web UI
@@ -446,49 +1149,48 @@ def play(device_name: Optional[str] = None) -> Dict[str, Any]:
     Returns:
         Dict: Status and message
     """
-    global is_paused, chromecast, media_controller, current_file_index, stream_active
-
     # Connect if not already connected
-    if chromecast is None:
-        if not find_chromecast(device_name):
+    with STATE.cast_lock:
+        connected = STATE.chromecast is not None or find_chromecast(device_name)
+        if not connected:
             logger.error(
                 f"Failed to connect to Chromecast: {device_name or DEFAULT_DEVICE}"
             )
             return {"status": "failed", "message": "Could not find Chromecast device"}
 
-    with lock:
+    with STATE.lock:
         # Prevent duplicate play requests
-        if not is_paused and stream_active:
+        if not STATE.is_paused and STATE.stream_active:
             logger.info("Playback already in progress, ignoring duplicate play request")
             return {"status": "playing", "message": "Already playing"}
-        
-        is_paused = False
-        current_file_index = 0
-        stream_active = True
 
-    # Stop current playback
-    if media_controller and chromecast:
-        try:
-            logger.info("Stopping current playback")
-            media_controller.stop()
-        except Exception:
-            pass
+        STATE.is_paused = False
+        STATE.current_file_index = 0
+        STATE.stream_generation += 1  # Any running stream is superseded now
+        STATE.stream_active = True
+        resume_event.set()
+        cc, mc = STATE.chromecast, STATE.media_controller
+        media_listener = STATE.media_listener
+    _wake_streams()
 
     mp3_files_list = get_mp3_files()
 
-    # Start playback on Chromecast (which will fetch /stream endpoint)
-    if not play_stream_on_chromecast():
+    # Only a PLAYING status reported after play_media counts
+    if media_listener:
+        media_listener.playing.clear()
+
+    # Stop current playback and start the stream (Chromecast fetches /stream),
+    # queued behind any pending control actions
+    if not mc or not cc:
+        return {"status": "playing", "files": len(mp3_files_list)}
+    if not _submit_cast_ctl(_restart_cast_playback, mc).result():
         return {"status": "playing", "files": len(mp3_files_list)}
 
     # Wait for player state to change
     timeout = 30
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        status = media_controller.status
-        if status.player_state == "PLAYING":
-            logger.info("Playback started successfully")
-            return {"status": "playing", "files": len(mp3_files_list)}
-        time.sleep(1)
+    if media_listener and media_listener.playing.wait(timeout=timeout):
+        logger.info("Playback started successfully")
+        return {"status": "playing", "files": len(mp3_files_list)}
 
     logger.error(f"Timeout waiting for playback to start (waited {timeout}s)")
     return {"status": "failed", "message": "Timeout waiting for playback to start"}
@@ -501,20 +1203,16 @@ def pause() -> Dict[str, str]:
     Returns:
         Dict: Status
     """
-    global is_paused
-
     logger.info("Pause requested")
 
-    with lock:
-        is_paused = True
+    with STATE.lock:
+        STATE.is_paused = True
+        resume_event.clear()
+        cc, mc = STATE.chromecast, STATE.media_controller
+    _wake_streams()
 
-    # Pause the media player on Chromecast (preserves position)
-    if media_controller and chromecast:
-        try:
-            logger.info("Pausing media controller")
-            media_controller.pause()
-        except Exception as e:
-            logger.error(f"Error pausing media controller: {e}")
+    if mc and cc:
+        _submit_cast_ctl(_pause_cast, mc)
 
     return {"status": "paused"}
 
@@ -526,27 +1224,17 @@ def resume() -> Dict[str, str]:
     Returns:
         Dict: Status
     """
-    global is_paused, stream_active
-
     logger.info("Resume requested")
 
-    with lock:
-        is_paused = False
-        stream_active = True
+    with STATE.lock:
+        STATE.is_paused = False
+        STATE.stream_active = True
+        resume_event.set()
+        cc, mc = STATE.chromecast, STATE.media_controller
+    _wake_streams()
 
-    # Check if resuming from paused state or stopped state
-    if media_controller and chromecast:
-        try:
-            # If media is paused (not stopped), resume from paused position
-            if media_controller.status and media_controller.status.player_state == "PAUSED":
-                logger.info("Resuming media controller from paused state")
-                media_controller.play()
-            else:
-                # Media is stopped, need to restart playback from beginning
-                logger.info("Media is stopped, restarting playback from beginning")
-                play_stream_on_chromecast()
-        except Exception as e:
-            logger.error(f"Error resuming stream: {e}")
+    if mc and cc:
+        _submit_cast_ctl(_resume_cast, mc)
 
     return {"status": "resumed"}
 
@@ -558,22 +1246,18 @@ def stop() -> Dict[str, str]:
     Returns:
         Dict: Status
     """
-    global is_paused, stream_active, current_file_index
-
     logger.info("Stop requested")
 
-    with lock:
-        is_paused = True
-        stream_active = False
-        current_file_index = 0
+    with STATE.lock:
+        STATE.is_paused = True
+        STATE.stream_active = False
+        STATE.current_file_index = 0
+        resume_event.set()  # Wake a held stream so it can exit
+        cc, mc = STATE.chromecast, STATE.media_controller
+    _wake_streams()
 
-    # Stop the media player on Chromecast
-    if media_controller and chromecast:
-        try:
-            logger.info("Stopping media controller")
-            media_controller.stop()
-        except Exception as e:
-            logger.error(f"Error stopping media controller: {e}")
+    if mc and cc:
+        _submit_cast_ctl(_stop_cast, mc)
 
     return {"status": "stopped"}
 
@@ -585,15 +1269,21 @@ def status() -> Dict[str, Any]:
     Returns:
         Dict: Current status information
     """
-    global current_file_index
     mp3_files_list = get_mp3_files()
+    with STATE.lock:
+        cc = STATE.chromecast
+        is_paused = STATE.is_paused
+        file_index = STATE.current_file_index
+        current_volume = STATE.current_volume
     return {
         "is_paused": is_paused,
         "files_count": len(mp3_files_list),
-        "chromecast_connected": chromecast is not None,
-        "selected_device": chromecast.cast_info.friendly_name if chromecast else None,
-        "current_file_index": current_file_index,
-        "current_file": mp3_files_list[current_file_index] if mp3_files_list else None,
+        "chromecast_connected": cc is not None,
+        "selected_device": cc.cast_info.friendly_name if cc else None,
+        "current_file_index": file_index,
+        "current_file": (
+            mp3_files_list[file_index] if file_index < len(mp3_files_list) else None
+        ),
         "current_volume": current_volume,
     }
 
@@ -605,10 +1295,22 @@ def files() -> Dict[str, Any]:
     Returns:
         Dict: List of files and current index
     """
-    global current_file_index
-    mp3_files_list = get_mp3_files()
-    files = [f.replace(MUSIC_FOLDER, "") for f in mp3_files_list]
-    return {"files": files, "current_file_index": current_file_index}
+    return {
+        "files": get_mp3_file_names(),
+        "current_file_index": STATE.current_file_index,
+    }
+
+
+@app.route("/files/refresh")
+def refresh_files() -> Dict[str, Any]:
+    """Rescan the music folder, e.g. after editing files in place
+
+    Returns:
+        Dict: Status and number of files found
+    """
+    logger.info("File list refresh requested")
+    invalidate_mp3_cache()
+    return {"status": "success", "files_count": len(get_mp3_files())}
 
 
 @app.route("/previous")
@@ -619,7 +1321,7 @@ def previous() -> Dict[str, Any]:
     Returns:
         Dict: Status and file index
     """
-    return change_track(-1)
+    return _seek(-1)
 
 
 @app.route("/next")
@@ -630,7 +1332,7 @@ def next() -> Dict[str, Any]:
     Returns:
         Dict: Status and file index
     """
-    return change_track(1)
+    return _seek(1)
 
 
 @app.route("/connect")
@@ -645,13 +1347,14 @@ def connect(device_name: Optional[str] = None) -> Dict[str, Any]:
         Dict: Connection status and device info
     """
     logger.info(f"Connecting to Chromecast: {device_name or DEFAULT_DEVICE}")
-    with lock:
+    with STATE.cast_lock:
         if find_chromecast(device_name):
-            return {
-                "status": "connected",
-                "device": chromecast.cast_info.friendly_name,
-                "volume": current_volume,
-            }
+            with STATE.lock:
+                return {
+                    "status": "connected",
+                    "device": STATE.chromecast.cast_info.friendly_name,
+                    "volume": STATE.current_volume,
+                }
         return {"status": "failed", "message": "Could not find Chromecast device"}
 
 
@@ -663,7 +1366,7 @@ def disconnect() -> Dict[str, str]:
         Dict: Disconnection status
     """
     logger.info("Disconnect request received")
-    with lock:
+    with STATE.cast_lock:
         if disconnect_chromecast():
             return {"status": "disconnected"}
         return {"status": "failed", "message": "No Chromecast device connected"}
@@ -676,38 +1379,29 @@ def devices() -> Dict[str, Any]:
     Returns:
         Dict: List of devices or error
     """
-    zconf = None
     try:
-        zconf = create_zeroconf()
-
-        # Use dict to deduplicate by UUID
-        devices_dict: Dict[str, Dict[str, str]] = {}
-
-        def add_device_callback(uuid, service):
-            """Callback for device discovery."""
-            device = browser.devices.get(uuid)
-            if device and uuid not in devices_dict:
-                devices_dict[uuid] = {
-                    "name": device.friendly_name,
-                    "model": device.model_name,
-                    "host": device.host,
-                    "port": str(device.port),
-                }
-                logger.debug(f"Discovered device: {device.friendly_name}")
-
-        listener = SimpleCastListener(add_callback=add_device_callback)
-        browser = CastBrowser(listener, zconf, known_hosts=None)
-        browser.start_discovery()
-
-        # Wait for discovery to complete
-        timeout = 5
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            time.sleep(0.1)
-
-        browser.stop_discovery()
-
-        devices_list = list(devices_dict.values())
+        browser = get_cast_browser()
+
+        # Give a freshly started browser time to hear from every device: stop
+        # once nothing new has shown up for a second, or at DISCOVERY_TIMEOUT
+        deadline = _cast_browser_started + DISCOVERY_TIMEOUT
+        with _cast_listener.changed:
+            while True:
+                wake_at = min(deadline, _cast_listener.last_change + 1.0)
+                remaining = wake_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                _cast_listener.changed.wait(remaining)
+
+        devices_list = [
+            {
+                "name": device.friendly_name,
+                "model": device.model_name,
+                "host": device.host,
+                "port": str(device.port),
+            }
+            for device in list(browser.devices.values())
+        ]
         logger.info(f"Found {len(devices_list)} Chromecast devices")
         return {"devices": devices_list}
     except OSError as e:
@@ -716,14 +1410,6 @@ def devices() -> Dict[str, Any]:
             "devices": [],
             "error": "Device discovery failed - network buffer issue",
         }
-    finally:
-        if zconf:
-            zconf.close()
-        if 'browser' in locals():
-            try:
-                browser.stop_discovery()
-            except Exception:
-                pass
 
 
 @app.route("/volume/<int:value>")
@@ -737,60 +1423,23 @@ def volume(value: int) -> Dict[str, Any]:
     Returns:
         Dict: Volume status or error
     """
-    global current_volume
-
     logger.info(f"Setting volume to {value}%")
 
     if value < 1 or value > 100:
         logger.warning(f"Invalid volume value: {value}")
         return {"status": "failed", "message": "Volume must be between 1 and 100"}
 
-    with lock:
+    with STATE.cast_lock:
         if set_volume(value):
+            cc = STATE.chromecast
             return {
                 "status": "success",
                 "volume": value,
-                "device": chromecast.cast_info.friendly_name,
+                "device": cc.cast_info.friendly_name if cc else None,
             }
         return {"status": "failed", "message": "Error setting volume"}
 
 
-def change_track(direction: int) -> Dict[str, Any]:
-    """Play previous or next file in the playlist
-
-    Args:
-        direction: -1 for previous, 1 for next
-
-    Returns:
-        Dict: Status and file index
-    """
-    global current_file_index, is_paused
-    mp3_files_list = get_mp3_files()
-    if not mp3_files_list:
-        logger.error("No MP3 files available")
-        return {"status": "failed", "message": "No MP3 files found"}
-
-    current_file_index = (current_file_index + direction + len(mp3_files_list)) % len(
-        mp3_files_list
-    )
-    logger.info(
-        f"Playing {'previous' if direction < 0 else 'next'} file: {current_file_index}"
-    )
-
-    with lock:
-        is_paused = False
-
-    if media_controller and chromecast:
-        try:
-            logger.info("Stopping media controller for track change")
-            media_controller.stop()
-            time.sleep(0.5)  # Wait for stop to complete
-            play_stream_on_chromecast()
-        except Exception as e:
-            logger.error(f"Error changing track: {e}")
-    return {"status": "success", "file_index": current_file_index}
-
-
 @app.route("/config")
 def config() -> Dict[str, Any]:
     """Get application configuration
@@ -800,15 +1449,14 @@ def config() -> Dict[str, Any]:
     """
     return {
         "default_volume": DEFAULT_VOLUME,
-        "current_volume": current_volume,
+        "current_volume": STATE.current_volume,
     }
 
 
 if __name__ == "__main__":
     print("Starting Google Cast Audio Streamer...")
     print(f"Place your MP3 files in '{MUSIC_FOLDER}' folder")
-    lan_ip = get_lan_ip()
-    print(f"Access the web interface at: http://{lan_ip}:{PORT}")
+    print(f"Access the web interface at: http://{LAN_IP}:{PORT}")
     print("\nAvailable endpoints:")
     print("  / - Web interface")
     print("  /play - Start playback")
@@ -818,6 +1466,8 @@ if __name__ == "__main__":
     print("  /stop - Stop playback")
     print("  /disconnect - Disconnect from Chromecast device")
     print("  /status - Get current status")
+    print("  /files/refresh - Rescan the music folder")
+    print("  /file/:index - Download a single MP3 file")
     print("  /previous - Play previous file")
     print("  /next - Play next file")
     print("  /connect - Connect to Chromecast device")
@@ -825,4 +1475,13 @@ if __name__ == "__main__":
     print("  /devices - List available Chromecast devices")
     print("  /volume/:value - Set volume (1-100)")
 
-    app.run(host="0.0.0.0", port=PORT, debug=False, use_reloader=False)
+    start_music_watcher()
+
+    # Start discovery early so devices are known by the first request
+    try:
+        get_cast_browser()
+    except OSError as e:
+        logger.error(f"Error starting Chromecast discovery: {e}")
+
+    # Serve with a thread pool so /stream doesn't hold up control requests
+    serve(app, host="0.0.0.0", port=PORT, threads=WSGI_THREADS)